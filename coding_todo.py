@@ -1,7 +1,11 @@
-import asyncio
-from datetime import datetime
+import bisect
+import itertools
+import operator
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence
 
 from mcp.server.fastmcp import FastMCP, Context
 from pydantic import BaseModel
@@ -12,21 +16,191 @@ class TodoStatus(str, Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
 
-# Todo model with coding project specific fields
-class Todo(BaseModel):
+# Status strings accepted by the tools and prompts, mapped to their enum members
+_STATUS_MAP: Dict[str, TodoStatus] = {s.value: s for s in TodoStatus}
+
+# Checkbox shown for each status in the todo list
+_MARKER: Dict[TodoStatus, str] = {
+    TodoStatus.PENDING: "[ ]",
+    TodoStatus.IN_PROGRESS: "[ ]",
+    TodoStatus.COMPLETED: "[x]",
+}
+
+# Creation sequence of Todo instances
+_todo_seq = itertools.count()
+
+# Todo model with coding project specific fields. Inputs are validated by the
+# tools that create and modify todos, so this is a plain slotted dataclass.
+@dataclass(slots=True)
+class Todo:
     id: str
     title: str
     description: str
     status: TodoStatus = TodoStatus.PENDING
-    created_at: datetime = datetime.now()
+    created_at: datetime = field(default_factory=datetime.now)
     updated_at: Optional[datetime] = None
     project: Optional[str] = None
     priority: int = 1  # 1 (lowest) to 5 (highest)
-    tags: List[str] = []
+    tags: List[str] = field(default_factory=list)
+    # Cached status.value, refreshed whenever the status changes
+    _status_str: str = field(init=False, repr=False, compare=False)
+    # Cached ", ".join(tags), refreshed by set_tags
+    _tags_joined: str = field(init=False, repr=False, compare=False)
+    # Creation order, the final tiebreak when suggesting todos
+    _seq: int = field(init=False, repr=False, compare=False, default_factory=_todo_seq.__next__)
+
+    def __post_init__(self) -> None:
+        self._status_str = self.status.value
+        self.set_tags(self.tags)
+
+    def set_tags(self, tags: Iterable[str]) -> None:
+        """Replace the tags, interning them since the same few recur across todos"""
+        self.tags = [sys.intern(tag) for tag in tags]
+        self._tags_joined = ", ".join(self.tags)
+
+    def to_dict(self) -> dict:
+        """Return the todo's fields as a plain dict"""
+        data = asdict(self)
+        del data["_status_str"]
+        del data["_tags_joined"]
+        del data["_seq"]
+        return data
+
+# Line separator and templates for the prompt bodies
+_NL = "\n"
+_SUMMARY_TEMPLATE = """Here are the current {status_text}todos {project_text}to summarize:
+
+{body}
+
+Please provide a concise summary of these todos and suggest an approach to tackle them efficiently."""
+_SUGGEST_TEMPLATE = """Here are the current pending todos in order of priority:
+
+{body}
+
+Based on these todos, which one should I tackle next and why? Please provide a brief recommendation."""
 
 # Store todos in memory
 todos: Dict[str, Todo] = {}
 
+# Monotonic id source, so ids are never reused after a delete
+_id_counter = itertools.count(1)
+
+def _next_todo_id() -> str:
+    """Return a fresh todo ID"""
+    return f"todo{next(_id_counter)}"
+
+# Rendered fragments per todo, refreshed on every mutation: the Markdown list
+# line and detail view for the resources, and the bullet lines of both prompts
+_LIST_HEADER = "# Coding Project Todos\n\n"
+_list_lines: Dict[str, str] = {}
+_details: Dict[str, str] = {}
+_summary_lines: Dict[str, str] = {}
+_suggest_lines: Dict[str, str] = {}
+
+def _render(todo: Todo) -> None:
+    """Recompute the cached fragments of a todo"""
+    line = f"{_MARKER[todo.status]} **{todo.title}** (ID: {todo.id}, Priority: {todo.priority})\n"
+    if todo.tags:
+        line += f"   Tags: {todo._tags_joined}\n"
+    _list_lines[todo.id] = line
+
+    parts = [
+        f"# Todo: {todo.title}\n\n",
+        f"**Status:** {todo._status_str}\n",
+        f"**Priority:** {todo.priority}/5\n",
+        f"**Created:** {todo.created_at.isoformat(sep=' ', timespec='minutes')}\n",
+    ]
+    if todo.updated_at:
+        parts.append(f"**Updated:** {todo.updated_at.isoformat(sep=' ', timespec='minutes')}\n")
+    if todo.project:
+        parts.append(f"**Project:** {todo.project}\n")
+    if todo.tags:
+        parts.append(f"**Tags:** {todo._tags_joined}\n")
+    parts.append(f"\n**Description:**\n{todo.description}\n")
+    _details[todo.id] = "".join(parts)
+
+    _summary_lines[todo.id] = f"- {todo.title} (Priority: {todo.priority}): {todo.description}"
+    _suggest_lines[todo.id] = (
+        f"- {todo.title} (Priority: {todo.priority}, Status: {todo._status_str}): {todo.description}"
+    )
+
+# Secondary indexes used by the prompt filters
+status_index: Dict[TodoStatus, Dict[str, Todo]] = {status: {} for status in TodoStatus}
+project_index: Dict[str, Dict[str, Todo]] = {}
+
+def _index(todo: Todo) -> None:
+    """Add a todo to the status and project indexes"""
+    status_index[todo.status][todo.id] = todo
+    _index_project(todo)
+
+def _unindex(todo: Todo) -> None:
+    """Remove a todo from the status and project indexes"""
+    del status_index[todo.status][todo.id]
+    _unindex_project(todo)
+
+def _index_project(todo: Todo) -> None:
+    """Add a todo to the project index"""
+    if todo.project:
+        project_index.setdefault(todo.project, {})[todo.id] = todo
+
+def _unindex_project(todo: Todo) -> None:
+    """Remove a todo from the project index"""
+    if todo.project:
+        project_todos = project_index[todo.project]
+        del project_todos[todo.id]
+        if not project_todos:
+            del project_index[todo.project]
+
+_creation_seq = operator.attrgetter("_seq")
+
+def _in_creation_order(bucket: Iterable[Todo]) -> List[Todo]:
+    """Sort index bucket entries back into creation order, since a todo moves to
+    the end of its bucket whenever it is re-indexed"""
+    return sorted(bucket, key=_creation_seq)
+
+# Packed sort keys of the todos that are not completed. The mutation tools keep
+# _pending_keys sorted with bisect, so suggest_next_todo only walks it;
+# _pending_entries maps id -> key and _pending_ids maps key -> id.
+_pending_keys: List[int] = []
+_pending_entries: Dict[str, int] = {}
+_pending_ids: Dict[int, str] = {}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _sort_key(todo: Todo) -> int:
+    """Pack (-priority, created_at, creation order) into one int, so keys are
+    unique and ties never fall back to comparing ids"""
+    created_us = (todo.created_at - _EPOCH) // _MICROSECOND
+    return (5 - todo.priority) << 128 | created_us << 64 | todo._seq
+
+def _set_pending_key(todo: Todo) -> None:
+    """Add or refresh the sort key of a todo that is not completed"""
+    _drop_pending_key(todo.id)
+    key = _sort_key(todo)
+    _pending_entries[todo.id] = key
+    _pending_ids[key] = todo.id
+    bisect.insort(_pending_keys, key)
+
+def _drop_pending_key(todo_id: str) -> None:
+    """Remove the sort key of a todo, if it has one"""
+    key = _pending_entries.pop(todo_id, None)
+    if key is not None:
+        del _pending_keys[bisect.bisect_left(_pending_keys, key)]
+        del _pending_ids[key]
+
+def _insert(todo: Todo) -> None:
+    """Store a new todo and register it with the indexes and caches"""
+    todos[todo.id] = todo
+    _index(todo)
+    _set_pending_key(todo)
+    _render(todo)
+
+def _check_priority(priority: int) -> None:
+    """Reject priorities outside the 1 to 5 range"""
+    if not 1 <= priority <= 5:
+        raise ValueError("Priority must be between 1 and 5")
+
 # Create an MCP server using FastMCP
 mcp = FastMCP("coding-todo-server")
 
@@ -34,37 +208,20 @@ mcp = FastMCP("coding-todo-server")
 @mcp.resource("todo://list")
 def get_todo_list() -> str:
     """List of all coding project todos"""
-    if not todos:
+    if not _list_lines:
         return "No todos found."
     
-    result = "# Coding Project Todos\n\n"
-    for todo_id, todo in todos.items():
-        status_marker = "[ ]" if todo.status != TodoStatus.COMPLETED else "[x]"
-        result += f"{status_marker} **{todo.title}** (ID: {todo_id}, Priority: {todo.priority})\n"
-        if todo.tags:
-            result += f"   Tags: {', '.join(todo.tags)}\n"
-    return result
+    return _LIST_HEADER + "".join(_list_lines.values())
 
 # Resource to view a specific todo
 @mcp.resource("todo://item/{todo_id}")
 def get_todo_item(todo_id: str) -> str:
     """Get details of a specific todo item"""
-    if todo_id not in todos:
+    detail = _details.get(todo_id)
+    if detail is None:
         raise ValueError(f"Todo not found: {todo_id}")
     
-    todo = todos[todo_id]
-    result = f"# Todo: {todo.title}\n\n"
-    result += f"**Status:** {todo.status.value}\n"
-    result += f"**Priority:** {todo.priority}/5\n"
-    result += f"**Created:** {todo.created_at.strftime('%Y-%m-%d %H:%M')}\n"
-    if todo.updated_at:
-        result += f"**Updated:** {todo.updated_at.strftime('%Y-%m-%d %H:%M')}\n"
-    if todo.project:
-        result += f"**Project:** {todo.project}\n"
-    if todo.tags:
-        result += f"**Tags:** {', '.join(todo.tags)}\n"
-    result += f"\n**Description:**\n{todo.description}\n"
-    return result
+    return detail
 
 # Prompt to summarize todos
 @mcp.prompt()
@@ -75,42 +232,56 @@ def summarize_todos(status: str = "pending", project: str = None) -> str:
         status: Filter by status (pending/in_progress/completed/all)
         project: Filter by project name
     """
-    filtered_todos = list(todos.values())
-    if status != "all":
-        filtered_todos = [t for t in filtered_todos if t.status.value == status]
-    if project:
-        filtered_todos = [t for t in filtered_todos if t.project == project]
+    filtered_todos: Iterable[Todo]
+    if status == "all":
+        if project:
+            filtered_todos = _in_creation_order(project_index.get(project, {}).values())
+        else:
+            # todos itself is kept in creation order
+            filtered_todos = todos.values()
+    else:
+        status_filter = _STATUS_MAP.get(status)
+        status_todos = status_index[status_filter] if status_filter is not None else {}
+        if not project:
+            filtered_todos = _in_creation_order(status_todos.values())
+        else:
+            # Intersect the buckets on their id keys, scanning the smaller one,
+            # so the filter never touches Todo attributes. Which bucket gets
+            # scanned only affects speed; matches are put in creation order.
+            project_todos = project_index.get(project, {})
+            if len(project_todos) < len(status_todos):
+                smaller, larger = project_todos, status_todos
+            else:
+                smaller, larger = status_todos, project_todos
+            filtered_todos = _in_creation_order(
+                [t for todo_id, t in smaller.items() if todo_id in larger]
+            )
     
     status_text = f"{status} " if status != "all" else ""
     project_text = f"for project {project} " if project else ""
+    lines = [_summary_lines[t.id] for t in filtered_todos]
     
-    return f"""Here are the current {status_text}todos {project_text}to summarize:
-
-{chr(10).join(f"- {t.title} (Priority: {t.priority}): {t.description}" for t in filtered_todos)}
-
-Please provide a concise summary of these todos and suggest an approach to tackle them efficiently."""
+    return _SUMMARY_TEMPLATE.format_map({
+        "status_text": status_text,
+        "project_text": project_text,
+        "body": _NL.join(lines),
+    })
 
 # Prompt to suggest which todo to tackle next
 @mcp.prompt()
 def suggest_next_todo() -> str:
     """Suggests which todo to tackle next based on priority and status"""
-    pending_todos = [t for t in todos.values() if t.status != TodoStatus.COMPLETED]
-    
-    if not pending_todos:
+    if not _pending_keys:
         return "There are no pending todos. Would you like suggestions for new coding tasks to add?"
     
-    # Sort by priority (highest first)
-    sorted_todos = sorted(pending_todos, key=lambda t: (-t.priority, t.created_at))
+    # Keys are ordered by priority (highest first), then creation time and order
+    lines = [_suggest_lines[_pending_ids[key]] for key in _pending_keys]
     
-    return f"""Here are the current pending todos in order of priority:
-
-{chr(10).join(f"- {t.title} (Priority: {t.priority}, Status: {t.status.value}): {t.description}" for t in sorted_todos)}
-
-Based on these todos, which one should I tackle next and why? Please provide a brief recommendation."""
+    return _SUGGEST_TEMPLATE.format_map({"body": _NL.join(lines)})
 
 # Tool to add a new todo
 @mcp.tool()
-def add_todo(title: str, description: str, project: str = None, priority: int = 1, tags: List[str] = None) -> str:
+def add_todo(title: str, description: str, project: str = None, priority: int = 1, tags: Optional[Sequence[str]] = ()) -> str:
     """Add a new todo item
     
     Args:
@@ -120,19 +291,19 @@ def add_todo(title: str, description: str, project: str = None, priority: int =
         priority: Priority from 1 (lowest) to 5 (highest)
         tags: List of tags related to the todo
     """
+    _check_priority(priority)
+    
     # Generate a new todo ID
-    todo_id = f"todo{len(todos) + 1}"
+    todo_id = _next_todo_id()
     
-    new_todo = Todo(
+    _insert(Todo(
         id=todo_id,
         title=title,
         description=description,
         project=project,
         priority=priority,
-        tags=tags or [],
-    )
-    
-    todos[todo_id] = new_todo
+        tags=list(tags) if tags else [],
+    ))
     
     return f"Added todo '{title}' with ID: {todo_id}"
 
@@ -145,16 +316,28 @@ def update_todo_status(id: str, status: str) -> str:
         id: The ID of the todo item
         status: New status (pending/in_progress/completed)
     """
-    if id not in todos:
+    todo = todos.get(id)
+    if todo is None:
         raise ValueError(f"Todo not found: {id}")
     
-    try:
-        todos[id].status = TodoStatus(status)
-        todos[id].updated_at = datetime.now()
-    except ValueError:
+    new_status = _STATUS_MAP.get(status)
+    if new_status is None:
         raise ValueError(f"Invalid status: {status}. Must be one of: pending, in_progress, completed")
     
-    return f"Updated todo '{todos[id].title}' status to {status}"
+    # Only move the todo between status buckets when its status really changes
+    if new_status is not todo.status:
+        del status_index[todo.status][id]
+        status_index[new_status][id] = todo
+    todo.status = new_status
+    todo._status_str = new_status.value
+    todo.updated_at = datetime.now()
+    if new_status is TodoStatus.COMPLETED:
+        _drop_pending_key(id)
+    elif id not in _pending_entries:
+        _set_pending_key(todo)
+    _render(todo)
+    
+    return f"Updated todo '{todo.title}' status to {status}"
 
 # Tool to delete a todo
 @mcp.tool()
@@ -164,13 +347,18 @@ def delete_todo(id: str) -> str:
     Args:
         id: The ID of the todo item to delete
     """
-    if id not in todos:
+    todo = todos.pop(id, None)
+    if todo is None:
         raise ValueError(f"Todo not found: {id}")
     
-    title = todos[id].title
-    del todos[id]
+    _unindex(todo)
+    _drop_pending_key(id)
+    del _list_lines[id]
+    del _details[id]
+    del _summary_lines[id]
+    del _suggest_lines[id]
     
-    return f"Deleted todo '{title}' (ID: {id})"
+    return f"Deleted todo '{todo.title}' (ID: {id})"
 
 # Tool to update a todo's details
 @mcp.tool()
@@ -186,38 +374,119 @@ def update_todo(id: str, title: str = None, description: str = None, project: st
         priority: New priority from 1 (lowest) to 5 (highest) (optional)
         tags: New list of tags (optional)
     """
-    if id not in todos:
+    todo = todos.get(id)
+    if todo is None:
         raise ValueError(f"Todo not found: {id}")
     
-    todo = todos[id]
+    if priority is not None:
+        _check_priority(priority)
+    
+    _apply_update(todo, title, description, project, priority, tags, datetime.now())
     
+    return f"Updated todo '{todo.title}' (ID: {id})"
+
+def _apply_update(todo: Todo, title: Optional[str], description: Optional[str],
+                  project: Optional[str], priority: Optional[int], tags: Optional[List[str]],
+                  now: datetime) -> None:
+    """Apply already validated changes to a todo and refresh its indexes and caches"""
     if title is not None:
         todo.title = title
     
     if description is not None:
         todo.description = description
     
-    if project is not None:
+    if project is not None and project != todo.project:
+        _unindex_project(todo)
         todo.project = project
+        _index_project(todo)
     
-    if priority is not None:
-        if not 1 <= priority <= 5:
-            raise ValueError("Priority must be between 1 and 5")
+    if priority is not None and priority != todo.priority:
         todo.priority = priority
+        if todo.id in _pending_entries:
+            _set_pending_key(todo)
     
     if tags is not None:
-        todo.tags = tags
+        todo.set_tags(tags)
     
     # Update the timestamp
-    todo.updated_at = datetime.now()
+    todo.updated_at = now
+    _render(todo)
+
+# Argument models for the batch tools
+class AddTodoSpec(BaseModel):
+    title: str
+    description: str
+    project: Optional[str] = None
+    priority: int = 1
+    tags: List[str] = []
+
+class UpdateTodoSpec(BaseModel):
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    project: Optional[str] = None
+    priority: Optional[int] = None
+    tags: Optional[List[str]] = None
+
+# Tool to add several todos in one call
+@mcp.tool()
+def add_todos(items: List[AddTodoSpec]) -> str:
+    """Add several todo items at once
     
-    return f"Updated todo '{todo.title}' (ID: {id})"
+    Args:
+        items: Todo items to add, each with the same fields as add_todo
+    """
+    # Validate the whole batch before adding anything
+    for item in items:
+        _check_priority(item.priority)
+    
+    lines = []
+    for item in items:
+        todo_id = _next_todo_id()
+        _insert(Todo(
+            id=todo_id,
+            title=item.title,
+            description=item.description,
+            project=item.project,
+            priority=item.priority,
+            tags=item.tags,
+        ))
+        lines.append(f"Added todo '{item.title}' with ID: {todo_id}")
+    
+    return _NL.join(lines)
+
+# Tool to update several todos in one call
+@mcp.tool()
+def update_todos(items: List[UpdateTodoSpec]) -> str:
+    """Update the details of several todo items at once
+    
+    Args:
+        items: Updates to apply, each with the same fields as update_todo
+    """
+    # Validate the whole batch before changing anything
+    targets = []
+    for item in items:
+        todo = todos.get(item.id)
+        if todo is None:
+            raise ValueError(f"Todo not found: {item.id}")
+        if item.priority is not None:
+            _check_priority(item.priority)
+        targets.append(todo)
+    
+    # The whole batch shares one update timestamp
+    now = datetime.now()
+    lines = []
+    for item, todo in zip(items, targets):
+        _apply_update(todo, item.title, item.description, item.project, item.priority, item.tags, now)
+        lines.append(f"Updated todo '{todo.title}' (ID: {item.id})")
+    
+    return _NL.join(lines)
 
 # Initialize with example todos
 def initialize_example_todos():
     example_todos = [
         Todo(
-            id="todo1",
+            id=_next_todo_id(),
             title="Implement user authentication",
             description="Add JWT-based authentication to the API endpoints",
             priority=4,
@@ -225,7 +494,7 @@ def initialize_example_todos():
             tags=["backend", "security"],
         ),
         Todo(
-            id="todo2",
+            id=_next_todo_id(),
             title="Fix CSS responsiveness",
             description="The dashboard layout breaks on mobile devices",
             priority=3,
@@ -233,7 +502,7 @@ def initialize_example_todos():
             tags=["frontend", "css", "bugfix"],
         ),
         Todo(
-            id="todo3",
+            id=_next_todo_id(),
             title="Write unit tests",
             description="Create tests for the new data processing module",
             priority=2,
@@ -243,7 +512,7 @@ def initialize_example_todos():
     ]
     
     for todo in example_todos:
-        todos[todo.id] = todo
+        _insert(todo)
 
 # Initialize and run server
 if __name__ == "__main__":
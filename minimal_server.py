@@ -1,5 +1,4 @@
 #!/usr/bin/env python
-import asyncio
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("minimal-server")